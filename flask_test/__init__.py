@@ -6,15 +6,24 @@ from .base import (
     validates_form,
 )
 from database import DatabaseSetup
+from .dom import HtmlResponseMixin
+from .profiling import ProfileResponseMixin
+from .scheduler import SchedulerPlugin, TestScheduler
+from .signals import SignalRecorder
 from .view import ViewSetup
 
 
 __all__ = (
     ApplicationSetup,
     DatabaseSetup,
+    HtmlResponseMixin,
     JsonResponseMixin,
+    ProfileResponseMixin,
     requires_login,
+    SchedulerPlugin,
+    SignalRecorder,
     TestCase,
+    TestScheduler,
     validates_form,
     ViewSetup,
 )
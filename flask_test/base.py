@@ -1,10 +1,24 @@
 from contextlib import contextmanager
+from copy import deepcopy
+from timeit import default_timer
 
-from flask import json, url_for
-from flask.ext.login import user_unauthorized
+from flask import current_app, json, url_for
+from flask.sessions import SecureCookieSessionInterface
 from flexmock import flexmock
 
 from werkzeug import cached_property
+from werkzeug.test import create_environ
+from . import caching
+from .dom import HtmlResponseMixin
+from .profiling import ProfileResponseMixin
+from .scaling import (
+    expected_exponent,
+    growth_exponent,
+    measure,
+    RowGenerator
+)
+from .signals import signal_recorder
+from .streaming import consume_stream
 from .view import ViewSetup
 from .database import DatabaseSetup
 
@@ -31,10 +45,22 @@ class TestCase(object):
     Base TestCase, all your Flask test cases should inherit this class
     """
     teardown_delete_data = True
+    in_memory_database = False
+    profile_requests = False
+    profile_threshold = None
+    profile_dir = '.profiles'
+    explain_queries = False
+    sequential_scan_threshold = 1000
+    query_plans = None
+    recorded_signals = None
+    signal_buffer_size = 10000
+    signal_recorder = None
+    _signal_mark = 0
     template = None
     view = None
     url = None
     setup_level = 'method'
+    class_setup_duration = None
     setup_delegators = [ApplicationSetup(), ViewSetup(), DatabaseSetup()]
 
     @property
@@ -98,25 +124,29 @@ class TestCase(object):
     @classmethod
     def setup_class(cls):
         """
-        Setup this test case when using class level setup
+        Setup this test case when using class or fork level setup
         """
-        if cls.setup_level == 'class':
+        if cls.setup_level in ('class', 'fork'):
+            started = default_timer()
             cls.before_class_setup()
             app = cls.create_app()
             for setup_delegator in cls.setup_delegators:
                 setup_delegator.setup(cls, app)
             cls.after_class_setup()
+            cls.class_setup_duration = default_timer() - started
 
     @classmethod
     def teardown_class(cls):
         """
-        Teardown this test case when using class level setup
+        Teardown this test case when using class or fork level setup
         """
-        if cls.setup_level == 'class':
+        if cls.setup_level in ('class', 'fork'):
+            started = default_timer()
             cls.before_class_teardown()
             for setup_delegator in reversed(cls.setup_delegators):
                 setup_delegator.teardown(cls)
             cls.after_class_teardown()
+            cls.class_setup_duration += default_timer() - started
 
     def setup_method(self, method):
         """
@@ -128,6 +158,8 @@ class TestCase(object):
             for setup_delegator in self.setup_delegators:
                 setup_delegator.setup(self, app)
             self.after_method_setup(method)
+        elif self.signal_recorder is not None:
+            self._signal_mark = self.signal_recorder.mark()
 
     def teardown_method(self, method):
         """
@@ -139,6 +171,15 @@ class TestCase(object):
                 setup_delegator.teardown(self)
             self.after_method_teardown(method)
 
+    def after_fork(self):
+        """
+        Invoked in the forked child process before each test when using
+        fork level setup.
+        """
+        for setup_delegator in self.setup_delegators:
+            if hasattr(setup_delegator, 'after_fork'):
+                setup_delegator.after_fork(self)
+
     def create_or_get_user(self):
         """
         Create a user and save it to database.
@@ -166,13 +207,41 @@ class TestCase(object):
                 s['user_id'] = None
 
     def requires_login(self):
-        return requires_login()
+        return requires_login(self.signal_recorder)
 
     def get_page(self):
         return self.client.get(url_for(self.view))
 
-    def _add_template(self, app, template, context):
-        self.templates.append((template, context))
+    def signal_events(self, name=None):
+        """
+        Returns the signals recorded during the current test.
+
+        :param name: signal name, e.g. 'template_rendered'
+        :returns: list of :class:`~flask_test.signals.SignalEvent`
+        """
+        return self.signal_recorder.events(self._signal_mark, name)
+
+    @property
+    def templates(self):
+        """
+        List of `(template, context)` tuples rendered during the current
+        test.
+        """
+        return [
+            (event.kwargs['template'], event.kwargs['context'])
+            for event in self.signal_events('template_rendered')
+        ]
+
+    @templates.setter
+    def templates(self, value):
+        # Assigning an empty list clears the templates recorded so far, as
+        # it did when templates was a plain list.
+        if value:
+            raise ValueError(
+                'templates is recorded from signals, only an empty list can '
+                'be assigned to clear it.'
+            )
+        self._signal_mark = self.signal_recorder.mark()
 
     def assert_template_used(self, name):
         """
@@ -213,6 +282,244 @@ class TestCase(object):
         except ContextVariableDoesNotExist:
             self.fail("Context variable does not exist: %s" % name)
 
+    def generate_rows(self, models, count):
+        """
+        Bulk inserts `count` synthetic rows for each given model. Column
+        values are generated from the column types and foreign keys are
+        pointed at existing rows of the referenced tables.
+
+        :param models: list of declarative models or tables
+        :param count: number of rows to add per model
+        """
+        with self._query_plans_paused():
+            RowGenerator(self.db).populate(models, count)
+
+    def assert_scales(self, target, models, volumes=(100, 1000, 10000),
+                      complexity='linear', tolerance=0.3, repeat=3):
+        """
+        Checks that the time taken by given callable or GET request grows
+        no faster than given complexity class as the number of rows in
+        given models grows.
+
+        The models are populated with synthetic rows up to each volume in
+        turn and `target` is timed (best of `repeat`) at every volume.
+
+        :param target: callable or URL to request with `self.client`
+        :param models: list of declarative models or tables to populate
+        :param volumes: row counts per model to measure at
+        :param complexity: one of 'constant', 'logarithmic', 'linear',
+            'linearithmic', 'quadratic' and 'cubic'
+        :param tolerance: allowed excess of the empirical growth exponent
+        :param repeat: number of timed runs per volume
+        :returns: list of `(volume, seconds)` tuples
+        """
+        if not callable(target):
+            url = target
+
+            def target():
+                return self.client.get(url)
+        volumes = sorted(volumes)
+        allowed = expected_exponent(complexity, volumes) + tolerance
+        generator = RowGenerator(self.db)
+        timings = []
+        populated = 0
+        for volume in volumes:
+            with self._query_plans_paused():
+                generator.populate(models, volume - populated)
+            populated = volume
+            timings.append(measure(target, repeat))
+        exponent = growth_exponent(volumes, timings)
+        assert exponent <= allowed, (
+            "Expected %s growth (exponent <= %.2f), measured exponent %.2f "
+            "with timings %s." % (
+                complexity,
+                allowed,
+                exponent,
+                ', '.join(
+                    '%d rows: %.4fs' % timing
+                    for timing in zip(volumes, timings)
+                )
+            )
+        )
+        return list(zip(volumes, timings))
+
+    @contextmanager
+    def _query_plans_paused(self):
+        if self.query_plans is None:
+            yield
+        else:
+            with self.query_plans.paused():
+                yield
+
+    def assert_no_sequential_scans(self):
+        """
+        Checks that no statement executed so far read a table with more
+        than `sequential_scan_threshold` rows in full. Requires
+        `explain_queries` to be enabled.
+        """
+        if self.query_plans is None:
+            raise ValueError('Query plan capture is not enabled.')
+        scans = self.query_plans.sequential_scans
+        assert not scans, "Sequential scans detected:\n%s" % '\n'.join(
+            '%s (%d rows) in view %s: %s' % (
+                scan.table, scan.rows, scan.view, scan.statement
+            )
+            for scan in scans
+        )
+
+    def stream(self, *args, **kwargs):
+        """
+        Issues an unbuffered request with `self.client` and consumes the
+        response chunk by chunk, recording time to first byte and chunk
+        sizes. Takes the same arguments as `self.client.open` plus
+        `trace_memory` and `keep_data`.
+
+        :returns: :class:`~flask_test.streaming.StreamResult`
+        """
+        return consume_stream(self.client, *args, **kwargs)
+
+    def assert_streams(self, result, min_chunks=2, max_ttfb_ratio=0.5,
+                       max_buffered_ratio=0.5):
+        """
+        Checks that a response consumed with :meth:`stream` was actually
+        streamed instead of being materialized before the first chunk was
+        sent.
+
+        :param result: result returned by :meth:`stream`
+        :param min_chunks: minimum number of non-empty chunks
+        :param max_ttfb_ratio: maximum share of the total response time
+            that may pass before the first chunk
+        :param max_buffered_ratio: maximum peak memory use relative to the
+            response size, checked only when memory was traced with
+            `trace_memory` (Python 3.4 or later)
+        """
+        chunks = len([size for size in result.chunks if size])
+        assert chunks >= min_chunks, (
+            "Expected at least %d chunks, got %d." % (min_chunks, chunks)
+        )
+        assert result.ttfb <= result.duration * max_ttfb_ratio, (
+            "First chunk was sent after %.4fs of %.4fs." % (
+                result.ttfb, result.duration
+            )
+        )
+        if result.peak_buffered_bytes is not None:
+            assert (
+                result.peak_buffered_bytes <=
+                result.total_bytes * max_buffered_ratio
+            ), (
+                "Peak memory use of %d bytes while streaming %d bytes." % (
+                    result.peak_buffered_bytes, result.total_bytes
+                )
+            )
+
+    def _measure_request(self, url, headers, **kwargs):
+        """
+        Issues a GET request and returns the response together with the
+        number of executed statements (`None` without Flask-SQLAlchemy) and
+        the request duration. The duration is taken from the signal
+        recorder and falls back to wall clock time when request signals
+        are not recorded.
+        """
+        queries = None
+        mark = self.signal_recorder.mark()
+        started = default_timer()
+        if 'sqlalchemy' in self.app.extensions:
+            with caching.QueryCounter(self.db.engine) as counter:
+                response = self.client.get(url, headers=headers, **kwargs)
+            queries = counter.count
+        else:
+            response = self.client.get(url, headers=headers, **kwargs)
+        duration = default_timer() - started
+        durations = self.signal_recorder.request_durations(mark)
+        return response, queries, durations[-1] if durations else duration
+
+    def assert_cacheable(self, url, require_cache_control=True,
+                         max_duration_ratio=0.5, **kwargs):
+        """
+        Checks that given URL emits validators (`ETag` or `Last-Modified`)
+        and `Cache-Control`, and honors conditional requests.
+
+        The request is replayed with `If-None-Match` and
+        `If-Modified-Since`, which should return an empty 304 response
+        while skipping the expensive work of the full request: it must
+        execute fewer database queries or, when the full request executed
+        none, take at most `max_duration_ratio` of its time. Every check is
+        added to the :mod:`flask_test.caching` summary.
+
+        :param url: URL to request with `self.client`
+        :param require_cache_control: whether a missing `Cache-Control`
+            header is a problem
+        :param max_duration_ratio: maximum conditional request duration
+            relative to the full request for views without queries
+        :returns: :class:`~flask_test.caching.CacheReport`
+        """
+        response, queries, duration = self._measure_request(
+            url, {}, **kwargs
+        )
+        self.assert200(response)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        cache_control = response.headers.get('Cache-Control')
+
+        problems = []
+        if not etag and not last_modified:
+            problems.append('no ETag or Last-Modified header')
+        if require_cache_control and not cache_control:
+            problems.append('no Cache-Control header')
+
+        conditional_status = None
+        conditional_queries = None
+        conditional_duration = None
+        if etag or last_modified:
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            conditional, conditional_queries, conditional_duration = (
+                self._measure_request(url, headers, **kwargs)
+            )
+            conditional_status = conditional.status_code
+            if conditional_status != 304:
+                problems.append(
+                    'conditional request returned %d' % conditional_status
+                )
+            elif conditional.data:
+                problems.append('304 response has a body')
+            if queries and conditional_queries >= queries:
+                problems.append(
+                    'conditional request executed %d of %d queries' % (
+                        conditional_queries, queries
+                    )
+                )
+            elif (
+                not queries and
+                conditional_duration > duration * max_duration_ratio
+            ):
+                problems.append(
+                    'conditional request took %.4fs of %.4fs' % (
+                        conditional_duration, duration
+                    )
+                )
+
+        report = caching.CacheReport(
+            url,
+            etag,
+            last_modified,
+            cache_control,
+            conditional_status,
+            queries,
+            conditional_queries,
+            duration,
+            conditional_duration,
+            problems
+        )
+        caching.reports.append(report)
+        assert not problems, "%s is not cacheable: %s." % (
+            url, '; '.join(problems)
+        )
+        return report
+
     def assert_redirects(self, response, location):
         """
         Checks if response is an HTTP redirect to the given location.
@@ -223,6 +530,45 @@ class TestCase(object):
         assert response.status_code in (301, 302)
         assert response.location == "http://localhost" + location
 
+    def assert_selector(self, response, selector, count=None, text=None):
+        """
+        Checks that the HTML response contains elements matching given CSS
+        selector.
+
+        :param response: Flask response
+        :param selector: CSS selector
+        :param count: exact number of elements that should match
+        :param text: text content at least one matching element should have
+        :returns: the matching elements
+        """
+        elements = response.html.select(selector)
+        if count is None:
+            assert elements, "No elements match %r." % selector
+        else:
+            assert len(elements) == count, (
+                "Expected %d elements to match %r, found %d." % (
+                    count, selector, len(elements)
+                )
+            )
+        if text is not None:
+            texts = [element.text.strip() for element in elements]
+            assert text in texts, (
+                "No element matching %r has text %r, found %r." % (
+                    selector, text, texts
+                )
+            )
+        return elements
+
+    def assert_no_selector(self, response, selector):
+        """
+        Checks that the HTML response contains no elements matching given
+        CSS selector.
+
+        :param response: Flask response
+        :param selector: CSS selector
+        """
+        self.assert_selector(response, selector, count=0)
+
     def assert_status(self, response, status_code):
         """
         Helper method to check matching response status.
@@ -297,6 +643,51 @@ class TestCase(object):
         """
         self.assert_status(response, 405)
 
+    def get_session(self, client=None):
+        """
+        Returns a read-only copy of the session stored in the cookie jar of
+        given client. Unlike `client.session_transaction()` the session is
+        never re-serialized or written back. Sessions stored in signed
+        cookies are decoded once per cookie value (i.e. once per response
+        that sets the cookie). Other session interfaces may keep a fixed
+        session id in the cookie, so their sessions are always reloaded.
+
+        :param client: test client, defaults to `self.client`
+        """
+        if client is None:
+            client = self.client
+        name = self.app.config['SESSION_COOKIE_NAME']
+        value = _get_cookie(client, name)
+        cached = getattr(client, '_session_cache', None)
+        cacheable = isinstance(
+            self.app.session_interface, SecureCookieSessionInterface
+        )
+        if not cacheable or cached is None or cached[0] != value:
+            headers = {}
+            if value is not None:
+                headers['Cookie'] = '%s=%s' % (name, value)
+            request = self.app.request_class(create_environ(headers=headers))
+            session = self.app.session_interface.open_session(
+                self.app, request
+            )
+            cached = client._session_cache = (value, dict(session or {}))
+        return deepcopy(cached[1])
+
+    def get_flash_messages(self, category_filter=None, client=None):
+        """
+        Returns the flash messages currently stored in the session as a
+        list of `(category, message)` tuples.
+
+        :param category_filter: list of categories to include, defaults to
+            all categories
+        :param client: test client, defaults to `self.client`
+        """
+        messages = self.get_session(client).get('_flashes', [])
+        return [
+            (category, message) for category, message in messages
+            if not category_filter or category in category_filter
+        ]
+
     def assert_flash_message(self, expected_category, expected_message):
         """
         Checks that given flash message was added in given category
@@ -305,12 +696,12 @@ class TestCase(object):
         :param expected_message: message that should have been added to the
             flash messages stack
         """
-        with self.client.session_transaction() as session:
-            messages = session['_flashes']
-            assert len(messages) == 1
-            category, message = messages[0]
-            assert category == expected_category
-            assert message == expected_message
+        messages = self.get_flash_messages([expected_category])
+        assert expected_message in [message for _, message in messages], (
+            "Flash message %r not found in category %r." % (
+                expected_message, expected_category
+            )
+        )
 
 
 class JsonResponseMixin(object):
@@ -326,27 +717,32 @@ def _make_test_response(response_class):
     """
     Extends the normal app response by patching the response class to
     include a `json` attribute for quickly getting the response body as
-    parsed as JSON.
+    parsed as JSON, an `html` attribute for querying the response body
+    with CSS selectors and a `profile` attribute for request profiling
+    stats.
     """
-    class TestResponse(response_class, JsonResponseMixin):
+    class TestResponse(response_class, JsonResponseMixin, HtmlResponseMixin,
+                       ProfileResponseMixin):
         pass
 
     return TestResponse
 
 
+def _get_cookie(client, name):
+    for cookie in client.cookie_jar:
+        if cookie.name == name:
+            return cookie.value
+
+
 @contextmanager
-def requires_login():
-    user_unauthorized_signals = []
-
-    def _on(sender):
-        user_unauthorized_signals.append(sender)
-
-    user_unauthorized.connect(_on)
-    try:
-        yield
-    finally:
-        user_unauthorized.disconnect(_on)
-        assert user_unauthorized_signals, "The view does not require login."
+def requires_login(recorder=None):
+    if recorder is None:
+        recorder = signal_recorder(current_app._get_current_object())
+    mark = recorder.mark()
+    yield
+    assert recorder.events(mark, 'user_unauthorized'), (
+        "The view does not require login."
+    )
 
 
 @contextmanager
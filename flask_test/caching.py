@@ -0,0 +1,93 @@
+"""
+HTTP caching and conditional request verification.
+
+Every check made with :meth:`TestCase.assert_cacheable` is collected into
+:data:`reports`. Enable the plugin in your ``conftest.py`` to get a
+cacheability summary at the end of the test run::
+
+    pytest_plugins = ['flask_test.caching']
+"""
+from collections import namedtuple
+
+from sqlalchemy import event
+
+
+CacheReport = namedtuple('CacheReport', [
+    'url',
+    'etag',
+    'last_modified',
+    'cache_control',
+    'conditional_status',
+    'queries',
+    'conditional_queries',
+    'duration',
+    'conditional_duration',
+    'problems',
+])
+
+
+reports = []
+
+
+class QueryCounter(object):
+    """
+    Counts the statements executed through given engine while active.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self.active = False
+        event.listen(engine, 'after_cursor_execute', self._count)
+
+    def _count(self, *args, **kwargs):
+        if self.active:
+            self.count += 1
+
+    def __enter__(self):
+        self.active = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.active = False
+        if hasattr(event, 'remove'):
+            event.remove(self.engine, 'after_cursor_execute', self._count)
+
+
+def format_reports(reports):
+    lines = []
+    for report in reports:
+        if report.problems:
+            status = 'NOT CACHEABLE (%s)' % '; '.join(report.problems)
+        else:
+            status = 'cacheable'
+        lines.append('%s: %s' % (report.url, status))
+        lines.append(
+            '    ETag: %s, Last-Modified: %s, Cache-Control: %s' % (
+                report.etag, report.last_modified, report.cache_control
+            )
+        )
+        if report.conditional_status is not None:
+            lines.append(
+                '    conditional: %d, queries %s -> %s, %s -> %s' % (
+                    report.conditional_status,
+                    report.queries,
+                    report.conditional_queries,
+                    _format_duration(report.duration),
+                    _format_duration(report.conditional_duration)
+                )
+            )
+    return lines
+
+
+def _format_duration(duration):
+    if duration is None:
+        return 'n/a'
+    return '%.4fs' % duration
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not reports:
+        return
+    terminalreporter.section('HTTP cacheability')
+    for line in format_reports(reports):
+        terminalreporter.write_line(line)
@@ -1,8 +1,17 @@
+import sqlite3
+
 from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.sql.expression import Executable, ClauseElement
 
+from .query_plans import QueryPlanRecorder
+
 
 class DatabaseSetup(object):
+    def __init__(self):
+        self._memory_connection = None
+        self._memory_tables = {}
+
     def delete_tables(self, db):
         tables = reversed(db.metadata.sorted_tables)
         for table in tables:
@@ -25,14 +34,112 @@ class DatabaseSetup(object):
         db.session.execute(TruncateTable(*tables))
         db.session.commit()
 
+    def memory_connection(self):
+        """
+        Returns the SQLite in-memory connection shared by all test cases
+        using ``in_memory_database``. The database lives as long as this
+        connection is open.
+        """
+        if self._memory_connection is None:
+            self._memory_connection = sqlite3.connect(
+                ':memory:',
+                check_same_thread=False
+            )
+        return self._memory_connection
+
+    def use_memory_database(self, app):
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': StaticPool,
+            'creator': self.memory_connection,
+        }
+
+    def check_memory_database(self, db):
+        """
+        Makes sure the engine actually serves the shared in-memory
+        connection. The engine options are only honoured by Flask-SQLAlchemy
+        2.4 and later, and only if the engine was not created already in
+        `create_app`.
+        """
+        connection = db.engine.raw_connection()
+        try:
+            shared = connection.connection is self.memory_connection()
+        finally:
+            connection.close()
+        if not isinstance(db.engine.pool, StaticPool) or not shared:
+            raise RuntimeError(
+                'in_memory_database requires Flask-SQLAlchemy>=2.4 and must '
+                'not access db.engine in create_app.'
+            )
+
+    def create_memory_tables(self, db):
+        """
+        Creates the tables of given metadata in the shared in-memory
+        database. Tables created earlier are reused when their definition
+        matches and recreated when another metadata defines a different
+        table with the same name.
+        """
+        tables = []
+        for table in db.metadata.sorted_tables:
+            signature = _table_signature(table)
+            existing = self._memory_tables.get(table.name)
+            if existing is not None and existing[1] == signature:
+                continue
+            if existing is not None:
+                existing[0].drop(bind=db.engine, checkfirst=True)
+            tables.append(table)
+            self._memory_tables[table.name] = (table, signature)
+        if tables:
+            db.metadata.create_all(bind=db.engine, tables=tables)
+
     def setup(self, obj, app):
-        pass
+        if obj.in_memory_database:
+            self.use_memory_database(app)
+        if 'sqlalchemy' in app.extensions:
+            db = app.extensions['sqlalchemy'].db
+            if obj.in_memory_database:
+                self.check_memory_database(db)
+                self.create_memory_tables(db)
+            if obj.explain_queries:
+                obj.query_plans = QueryPlanRecorder(
+                    db.engine,
+                    obj.sequential_scan_threshold,
+                    db.metadata.tables.keys()
+                )
+
+    def after_fork(self, obj):
+        if 'sqlalchemy' in obj.app.extensions:
+            db = obj.app.extensions['sqlalchemy'].db
+            # Closing the inherited connections would also end the parent's
+            # database sessions, so they are only dereferenced.
+            db.session.registry.clear()
+            db.engine.pool = db.engine.pool.recreate()
 
     def teardown(self, obj):
+        if obj.query_plans is not None:
+            obj.query_plans.remove()
         if 'sqlalchemy' in obj.app.extensions:
             db = obj.app.extensions['sqlalchemy'].db
             db.session.remove()
-            if obj.teardown_delete_data:
+            if obj.teardown_delete_data or obj.in_memory_database:
                 self.delete_tables(db)
             db.session.close_all()
-            db.engine.dispose()
+            if not obj.in_memory_database:
+                # Disposing the static pool would close the shared
+                # in-memory connection and drop the whole schema.
+                db.engine.dispose()
+
+
+def _table_signature(table):
+    columns = tuple(
+        (
+            column.name,
+            repr(column.type),
+            column.primary_key,
+            column.nullable,
+            tuple(sorted(fk.target_fullname for fk in column.foreign_keys))
+        )
+        for column in table.columns
+    )
+    indexes = tuple(sorted(index.name for index in table.indexes))
+    return columns, indexes
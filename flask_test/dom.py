@@ -0,0 +1,320 @@
+import re
+
+try:
+    from html.parser import HTMLParser
+except ImportError:
+    from HTMLParser import HTMLParser
+
+from werkzeug import cached_property
+
+
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+])
+
+
+_PARAGRAPH_SCOPE = frozenset([
+    'applet', 'button', 'caption', 'html', 'marquee', 'object', 'table',
+    'td', 'template', 'th'
+])
+
+_CLOSES_PARAGRAPH = (frozenset(['p']), _PARAGRAPH_SCOPE)
+
+
+#: Start tags that implicitly close open elements, mapped to the tags they
+#: close and the tags delimiting the search for them.
+IMPLIED_END_TAGS = dict(
+    [
+        (tag, _CLOSES_PARAGRAPH) for tag in [
+            'address', 'article', 'aside', 'blockquote', 'details',
+            'dialog', 'div', 'dl', 'fieldset', 'figcaption', 'figure',
+            'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+            'hgroup', 'hr', 'main', 'menu', 'nav', 'ol', 'p', 'pre',
+            'section', 'table', 'ul'
+        ]
+    ] + [
+        ('li', (frozenset(['li', 'p']), frozenset(['ol', 'ul']))),
+        ('dt', (frozenset(['dd', 'dt', 'p']), frozenset(['dl']))),
+        ('dd', (frozenset(['dd', 'dt', 'p']), frozenset(['dl']))),
+        ('option', (
+            frozenset(['option']),
+            frozenset(['datalist', 'optgroup', 'select'])
+        )),
+        ('optgroup', (
+            frozenset(['optgroup', 'option']),
+            frozenset(['select'])
+        )),
+        ('td', (frozenset(['td', 'th']), frozenset(['table', 'tr']))),
+        ('th', (frozenset(['td', 'th']), frozenset(['table', 'tr']))),
+        ('tr', (
+            frozenset(['td', 'th', 'tr']),
+            frozenset(['table', 'tbody', 'tfoot', 'thead'])
+        )),
+    ] + [
+        (tag, (
+            frozenset(['tbody', 'td', 'tfoot', 'th', 'thead', 'tr']),
+            frozenset(['table'])
+        ))
+        for tag in ['tbody', 'tfoot', 'thead']
+    ]
+)
+
+
+class SelectorError(ValueError):
+    pass
+
+
+class Element(object):
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+
+    @property
+    def id(self):
+        return self.attrs.get('id')
+
+    @property
+    def classes(self):
+        return self.attrs.get('class', '').split()
+
+    @property
+    def text(self):
+        """
+        Text content of this element and all its descendants.
+        """
+        parts = []
+        for child in self.children:
+            if isinstance(child, Element):
+                parts.append(child.text)
+            else:
+                parts.append(child)
+        return ''.join(parts)
+
+    def __repr__(self):
+        return '<Element %s %r>' % (self.tag, self.attrs)
+
+
+class Document(object):
+    """
+    Parsed HTML document with indexes from tag names, ids and classes to
+    elements, so that selector lookups don't need to walk the whole tree.
+    """
+    def __init__(self, source):
+        self.root = Element('#document', {})
+        self.elements = []
+        self.ids = {}
+        self.classes = {}
+        self.tags = {}
+        self._position = {}
+        _DocumentParser(self).feed(source)
+
+    def add(self, element):
+        self._position[element] = len(self.elements)
+        self.elements.append(element)
+        self.tags.setdefault(element.tag, []).append(element)
+        if element.id is not None:
+            self.ids.setdefault(element.id, element)
+        for class_ in element.classes:
+            self.classes.setdefault(class_, []).append(element)
+
+    def get_element_by_id(self, id):
+        return self.ids.get(id)
+
+    def select(self, selector):
+        """
+        Returns the elements matching given CSS selector in document order.
+
+        Supported are type, universal, id, class and attribute
+        (``[attr]``, ``[attr=value]``) selectors, the descendant and child
+        combinators and selector groups separated with commas.
+        """
+        matches = set()
+        for group in _parse_selector(selector):
+            for element in self._candidates(group[-1]):
+                if _matches_group(element, group):
+                    matches.add(element)
+        return sorted(matches, key=self._position.__getitem__)
+
+    def select_one(self, selector):
+        elements = self.select(selector)
+        return elements[0] if elements else None
+
+    def _candidates(self, compound):
+        tag, id, classes, attrs = compound
+        if id is not None:
+            element = self.ids.get(id)
+            return [element] if element is not None else []
+        if classes:
+            return min(
+                (self.classes.get(class_, []) for class_ in classes),
+                key=len
+            )
+        if tag is not None:
+            return self.tags.get(tag, [])
+        return self.elements
+
+
+class _DocumentParser(HTMLParser):
+    def __init__(self, document):
+        HTMLParser.__init__(self)
+        self.document = document
+        self.stack = [document.root]
+
+    def handle_starttag(self, tag, attrs):
+        element = self._add(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self._add(tag, attrs)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                break
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(self.unescape('&%s;' % name))
+
+    def handle_charref(self, name):
+        self.handle_data(self.unescape('&#%s;' % name))
+
+    def unescape(self, source):
+        try:
+            from html import unescape
+        except ImportError:
+            return HTMLParser.unescape(self, source)
+        return unescape(source)
+
+    def close_implied(self, tag):
+        """
+        Closes the open elements given start tag implicitly ends, e.g. an
+        open ``li`` when another ``li`` starts.
+        """
+        if tag not in IMPLIED_END_TAGS:
+            return
+        closes, boundaries = IMPLIED_END_TAGS[tag]
+        end = None
+        for index in range(len(self.stack) - 1, 0, -1):
+            element_tag = self.stack[index].tag
+            if element_tag in closes:
+                end = index
+            elif element_tag in boundaries:
+                break
+        if end is not None:
+            del self.stack[end:]
+
+    def _add(self, tag, attrs):
+        self.close_implied(tag)
+        parent = self.stack[-1]
+        element = Element(
+            tag, dict((name, value or '') for name, value in attrs), parent
+        )
+        parent.children.append(element)
+        self.document.add(element)
+        return element
+
+
+_TOKEN = re.compile(r'''
+    \s*(?P<combinator>>)\s*
+    | (?P<descendant>\s+)
+    | (?P<tag>[\w-]+|\*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<class>[\w-]+)
+    | \[\s*(?P<attr>[\w-]+)\s*
+        (?:=\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]*)\s*)?\]
+''', re.X)
+
+
+def _parse_selector(selector):
+    """
+    Parses a selector into groups of alternating compounds and
+    combinators. Each compound is a `[tag, id, classes, attrs]` list.
+    """
+    groups = []
+    for source in selector.split(','):
+        source = source.strip()
+        group = []
+        compound = None
+        position = 0
+        while position < len(source):
+            match = _TOKEN.match(source, position)
+            if match is None:
+                raise SelectorError('Invalid selector: %r' % selector)
+            position = match.end()
+            kind = match.lastgroup
+            if kind in ('combinator', 'descendant'):
+                if compound is None:
+                    raise SelectorError('Invalid selector: %r' % selector)
+                group.extend([compound, '>' if kind == 'combinator' else ' '])
+                compound = None
+                continue
+            if compound is None:
+                compound = [None, None, [], []]
+            if kind == 'tag':
+                compound[0] = None if match.group('tag') == '*' else (
+                    match.group('tag').lower()
+                )
+            elif kind == 'id':
+                compound[1] = match.group('id')
+            elif kind == 'class':
+                compound[2].append(match.group('class'))
+            else:
+                value = match.group('value')
+                if value and value[0] in '"\'':
+                    value = value[1:-1]
+                compound[3].append((match.group('attr'), value))
+        if compound is None:
+            raise SelectorError('Invalid selector: %r' % selector)
+        group.append(compound)
+        groups.append(group)
+    return groups
+
+
+def _matches_compound(element, compound):
+    tag, id, classes, attrs = compound
+    if tag is not None and element.tag != tag:
+        return False
+    if id is not None and element.id != id:
+        return False
+    if classes and not set(classes).issubset(element.classes):
+        return False
+    for name, value in attrs:
+        if name not in element.attrs:
+            return False
+        if value is not None and element.attrs[name] != value:
+            return False
+    return True
+
+
+def _matches_group(element, group):
+    if not _matches_compound(element, group[-1]):
+        return False
+    if len(group) == 1:
+        return True
+    combinator, rest = group[-2], group[:-2]
+    ancestor = element.parent
+    while ancestor is not None and ancestor.tag != '#document':
+        if _matches_group(ancestor, rest):
+            return True
+        if combinator == '>':
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+class HtmlResponseMixin(object):
+    """
+    Mixin giving responses an `html` attribute with the body parsed as a
+    :class:`Document` on first access.
+    """
+    @cached_property
+    def html(self):
+        return Document(self.data.decode(getattr(self, 'charset', 'utf-8')))
@@ -0,0 +1,102 @@
+"""
+Copy-on-write test isolation for test cases using ``setup_level = 'fork'``.
+
+The application and all setup delegators are set up once per test case
+class in the parent process, exactly like with ``setup_level = 'class'``.
+Every test method then runs in a forked child process which inherits the
+warmed up state, reports its outcome back over a pipe and exits without
+any teardown.
+
+Isolation only holds for in-process state: the app, its configuration and
+an ``in_memory_database`` are thrown away with the child. Writes to a file
+backed or network database persist into the parent and later tests. The
+child drops the session and pooled connections inherited from the parent
+without closing them (see :meth:`TestCase.after_fork`) and opens its own.
+
+Enable the plugin by importing its hook in your ``conftest.py``::
+
+    from flask_test.fork import pytest_pyfunc_call  # noqa
+"""
+import os
+import pickle
+import sys
+import traceback
+
+
+class ForkedTestFailure(AssertionError):
+    pass
+
+
+def run_forked(func, *args, **kwargs):
+    """
+    Runs given function in a forked child process and re-raises its
+    failure in the parent. Falls back to a regular call on platforms
+    without :func:`os.fork`.
+    """
+    if not hasattr(os, 'fork'):
+        return func(*args, **kwargs)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            _run_child(write_fd, func, args, kwargs)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+
+    if not data:
+        raise ForkedTestFailure(
+            'Test process %d exited without reporting a result.' % pid
+        )
+    outcome = pickle.loads(data)
+    if outcome is None:
+        return
+    exception, formatted_traceback = outcome
+    if exception is None or isinstance(exception, Exception):
+        raise ForkedTestFailure(formatted_traceback)
+    # Test outcomes such as pytest's skip and xfail derive from
+    # BaseException and are re-raised as is.
+    raise exception
+
+
+def _run_child(write_fd, func, args, kwargs):
+    outcome = None
+    try:
+        func(*args, **kwargs)
+    except BaseException:
+        exception = sys.exc_info()[1]
+        formatted_traceback = ''.join(
+            traceback.format_exception(*sys.exc_info())
+        )
+        try:
+            pickle.dumps(exception)
+        except Exception:
+            exception = None
+        outcome = (exception, formatted_traceback)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with os.fdopen(write_fd, 'wb') as pipe:
+        pickle.dump(outcome, pipe)
+
+
+def pytest_pyfunc_call(pyfuncitem):
+    cls = getattr(pyfuncitem, 'cls', None)
+    if getattr(cls, 'setup_level', None) != 'fork':
+        return None
+    funcargs = pyfuncitem.funcargs
+    testargs = dict(
+        (arg, funcargs[arg]) for arg in pyfuncitem._fixtureinfo.argnames
+    )
+
+    def run_test():
+        pyfuncitem.instance.after_fork()
+        pyfuncitem.obj(**testargs)
+
+    run_forked(run_test)
+    return True
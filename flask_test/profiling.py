@@ -0,0 +1,109 @@
+import cProfile
+import os
+import pstats
+import re
+from timeit import default_timer
+
+
+class ProfileResponseMixin(object):
+    """
+    Mixin giving responses a `profile` attribute holding the
+    :class:`pstats.Stats` of the request when request profiling is enabled.
+    """
+    profile = None
+
+    def print_hotspots(self, limit=20, sort='cumulative'):
+        if self.profile is None:
+            raise ValueError('Request profiling is not enabled.')
+        self.profile.sort_stats(sort).print_stats(limit)
+
+
+def profiled_test_client(test_case, client):
+    """
+    Decorates test client to run every request under :mod:`cProfile`.
+
+    The stats are attached to the response as `response.profile`. Requests
+    slower than `test_case.profile_threshold` seconds are also dumped to
+    `test_case.profile_dir` both as a `.prof` file and as a `.collapsed`
+    file usable with flamegraph tools.
+    """
+    original_open = client.open
+    # Redirects are followed by calling open again from within open, only
+    # the outermost call is profiled.
+    active = []
+
+    def profiled_open(*args, **kwargs):
+        if active:
+            return original_open(*args, **kwargs)
+        profiler = cProfile.Profile()
+        active.append(profiler)
+        started = default_timer()
+        profiler.enable()
+        try:
+            response = original_open(*args, **kwargs)
+        finally:
+            profiler.disable()
+            active.pop()
+        duration = default_timer() - started
+
+        if not kwargs.get('as_tuple'):
+            response.profile = pstats.Stats(profiler)
+        threshold = test_case.profile_threshold
+        if threshold is not None and duration > threshold:
+            path = args[0] if args else kwargs.get('path', '/')
+            name = getattr(test_case, '__name__', type(test_case).__name__)
+            dump_profile(
+                profiler, test_case.profile_dir, '%s-%s' % (name, path)
+            )
+        return response
+
+    client.open = profiled_open
+    return client
+
+
+def dump_profile(profiler, directory, name):
+    """
+    Writes given profile to `<directory>/<name>.prof` and
+    `<directory>/<name>.collapsed` and returns the path without extension.
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_')
+    base = os.path.join(directory, name)
+    counter = 1
+    while os.path.exists(base + '.prof'):
+        counter += 1
+        base = os.path.join(directory, '%s-%d' % (name, counter))
+
+    profiler.dump_stats(base + '.prof')
+    with open(base + '.collapsed', 'w') as f:
+        for line in collapsed_stacks(pstats.Stats(profiler)):
+            f.write(line + '\n')
+    return base
+
+
+def collapsed_stacks(stats):
+    """
+    Converts profile stats into collapsed stack lines
+    (``caller;callee microseconds``).
+
+    cProfile only records caller-callee pairs, not complete stacks, so each
+    line is a two frame stack weighted by the time spent in the callee when
+    called from that caller.
+    """
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if not callers:
+            yield '%s %d' % (_label(func), tt * 1000000)
+        for caller, caller_stats in callers.items():
+            # Caller values are (cc, nc, tt, ct) tuples, older Python
+            # versions only record the call count.
+            if isinstance(caller_stats, tuple):
+                time = caller_stats[2]
+            else:
+                time = tt * caller_stats / float(nc or 1)
+            yield '%s;%s %d' % (_label(caller), _label(func), time * 1000000)
+
+
+def _label(func):
+    filename, line, name = func
+    return '%s (%s:%d)' % (name, os.path.basename(filename), line)
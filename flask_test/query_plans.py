@@ -0,0 +1,159 @@
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+
+SequentialScan = namedtuple(
+    'SequentialScan',
+    ['statement', 'table', 'rows', 'view']
+)
+
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+class QueryPlanRecorder(object):
+    """
+    Runs ``EXPLAIN`` on every distinct statement executed through given
+    engine and records full table scans on tables with more than
+    `threshold` rows.
+
+    Plans are cached per statement text (which has its parameters bound
+    separately), so each statement shape is explained only once. Table
+    sizes are cached until the next write statement. Only scans of
+    `table_names` are reported when given. Statements executed within
+    :meth:`paused` are not reported.
+    """
+    def __init__(self, engine, threshold=1000, table_names=None):
+        self.engine = engine
+        self.threshold = threshold
+        self.table_names = table_names
+        self.plans = {}
+        self.sequential_scans = []
+        self._scanned_tables = {}
+        self._reported = set()
+        self._row_counts = {}
+        self._paused = 0
+        self.active = True
+        event.listen(engine, 'after_cursor_execute', self._record)
+
+    def remove(self):
+        if not self.active:
+            return
+        self.active = False
+        if hasattr(event, 'remove'):
+            event.remove(self.engine, 'after_cursor_execute', self._record)
+
+    @contextmanager
+    def paused(self):
+        """
+        Context manager for executing statements that are not reported,
+        such as the ones issued by test helpers.
+        """
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+    def _record(self, conn, cursor, statement, parameters, context,
+                executemany):
+        if not self.active:
+            return
+        if not re.match(r'\s*(SELECT|WITH)\b', statement, re.I):
+            self._row_counts.clear()
+        if self._paused or executemany or not re.match(
+            r'\s*(SELECT|UPDATE|DELETE|WITH)\b', statement, re.I
+        ):
+            return
+        if conn.dialect.name not in EXPLAIN_PREFIXES:
+            return
+
+        if statement not in self.plans:
+            plan, description = self.explain(conn, statement, parameters)
+            self.plans[statement] = plan
+            self._scanned_tables[statement] = self.scanned_tables(
+                conn.dialect.name, statement, plan, description
+            )
+
+        view = request.endpoint if has_request_context() else None
+        for table in self._scanned_tables[statement]:
+            key = (statement, table, view)
+            if key in self._reported:
+                continue
+            if table not in self._row_counts:
+                self._row_counts[table] = self.count_rows(conn, table)
+            rows = self._row_counts[table]
+            if rows is not None and rows > self.threshold:
+                self._reported.add(key)
+                self.sequential_scans.append(
+                    SequentialScan(statement, table, rows, view)
+                )
+
+    def explain(self, conn, statement, parameters):
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(
+                EXPLAIN_PREFIXES[conn.dialect.name] + statement, parameters
+            )
+            return cursor.fetchall(), cursor.description
+        finally:
+            cursor.close()
+
+    def scanned_tables(self, dialect_name, statement, plan, description):
+        """
+        Returns the names of the tables given plan reads in full.
+        """
+        tables = []
+        if dialect_name == 'sqlite':
+            for row in plan:
+                match = re.match(r'SCAN (?:TABLE )?(\w+)', row[-1])
+                if match and 'INDEX' not in row[-1]:
+                    tables.append(match.group(1))
+        elif dialect_name == 'postgresql':
+            for row in plan:
+                match = re.search(r'Seq Scan on (\w+)', row[0])
+                if match:
+                    tables.append(match.group(1))
+        elif dialect_name == 'mysql':
+            columns = [column[0] for column in description]
+            table_index = columns.index('table')
+            type_index = columns.index('type')
+            for row in plan:
+                if row[type_index] == 'ALL' and row[table_index]:
+                    tables.append(row[table_index])
+        tables = [_resolve_alias(statement, table) for table in tables]
+        if self.table_names is not None:
+            tables = [table for table in tables if table in self.table_names]
+        return tables
+
+    def count_rows(self, conn, table):
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(
+                'SELECT COUNT(*) FROM %s' %
+                conn.dialect.identifier_preparer.quote(table)
+            )
+            return cursor.fetchone()[0]
+        except Exception:
+            # Plans may name things that can not be counted directly, such
+            # as subqueries or CTEs.
+            return None
+        finally:
+            cursor.close()
+
+
+def _resolve_alias(statement, name):
+    match = re.search(
+        r'(\w+)"?\s+AS\s+"?%s\b' % re.escape(name), statement, re.I
+    )
+    if match:
+        return match.group(1)
+    return name
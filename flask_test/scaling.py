@@ -0,0 +1,167 @@
+import math
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from timeit import default_timer
+
+from sqlalchemy import func, types
+
+
+COMPLEXITY_CLASSES = {
+    'constant': lambda n: 1.0,
+    'logarithmic': lambda n: math.log(n),
+    'linear': lambda n: float(n),
+    'linearithmic': lambda n: n * math.log(n),
+    'quadratic': lambda n: float(n) ** 2,
+    'cubic': lambda n: float(n) ** 3,
+}
+
+
+class RowGenerator(object):
+    """
+    Bulk generates synthetic rows for tables based on their column types
+    and foreign keys.
+
+    Rows are inserted with a single executemany Core insert per table,
+    bypassing the ORM unit of work. Foreign key values are picked from the
+    rows already present in the referenced table, which is why
+    :meth:`populate` fills parent tables first.
+    """
+    epoch = datetime(2000, 1, 1)
+
+    def __init__(self, db):
+        self.db = db
+
+    def populate(self, models, count):
+        """
+        Inserts `count` rows into the table of each given model or table,
+        parents first.
+        """
+        tables = set(getattr(model, '__table__', model) for model in models)
+        for table in self.db.metadata.sorted_tables:
+            if table in tables:
+                self.insert(table, count)
+        self.db.session.commit()
+
+    def insert(self, table, count):
+        if count <= 0:
+            return
+        start = self.next_primary_key(table)
+        references = self.references(table)
+        rows = [
+            self.row(table, index, references)
+            for index in range(start, start + count)
+        ]
+        self.db.session.execute(table.insert(), rows)
+
+    def next_primary_key(self, table):
+        columns = list(table.primary_key.columns)
+        if len(columns) == 1 and isinstance(columns[0].type, types.Integer):
+            highest = self.db.session.query(func.max(columns[0])).scalar()
+            return (highest or 0) + 1
+        return self.db.session.query(func.count()).select_from(table).scalar()
+
+    def references(self, table):
+        references = {}
+        for column in table.columns:
+            for foreign_key in column.foreign_keys:
+                values = [
+                    row[0] for row in
+                    self.db.session.query(foreign_key.column).all()
+                ]
+                if not values and not column.nullable:
+                    raise ValueError(
+                        'Cannot generate rows for %s, referenced table %s '
+                        'is empty.' % (table.name, foreign_key.column.table)
+                    )
+                references[column.name] = values
+        return references
+
+    def row(self, table, index, references):
+        row = {}
+        for column in table.columns:
+            if column.name in references:
+                values = references[column.name]
+                if values:
+                    row[column.name] = values[index % len(values)]
+                else:
+                    row[column.name] = None
+            elif column.primary_key or (
+                column.default is None and column.server_default is None
+            ):
+                row[column.name] = self.value(column, index)
+        return row
+
+    def value(self, column, index):
+        type_ = column.type
+        if isinstance(type_, types.Enum):
+            return type_.enums[index % len(type_.enums)]
+        if isinstance(type_, types.Boolean):
+            return index % 2 == 0
+        if isinstance(type_, types.Integer):
+            return index
+        if isinstance(type_, types.Float):
+            return index + 0.5
+        if isinstance(type_, types.Numeric):
+            return Decimal(index)
+        if isinstance(type_, types.DateTime):
+            return self.epoch + timedelta(seconds=index)
+        if isinstance(type_, types.Date):
+            return self.epoch.date() + timedelta(days=index)
+        if isinstance(type_, types.Time):
+            return time(index // 3600 % 24, index // 60 % 60, index % 60)
+        if isinstance(type_, types.String):
+            value = u'%s-%d' % (column.name, index)
+            if type_.length:
+                value = value[-type_.length:]
+            return value
+        if isinstance(type_, types.LargeBinary):
+            return (u'%d' % index).encode('ascii')
+        if column.nullable:
+            return None
+        raise TypeError(
+            'Cannot generate values for column %s of type %r.' % (
+                column, type_
+            )
+        )
+
+
+def measure(callable_, repeat=3):
+    """
+    Returns the best wall clock time of `repeat` calls of given callable.
+    """
+    timings = []
+    for i in range(repeat):
+        started = default_timer()
+        callable_()
+        timings.append(default_timer() - started)
+    return min(timings)
+
+
+def growth_exponent(volumes, timings):
+    """
+    Returns the least squares slope of log(timing) against log(volume),
+    i.e. the empirical exponent `k` in `timing ~ volume ** k`.
+    """
+    xs = [math.log(volume) for volume in volumes]
+    ys = [math.log(max(timing, 1e-9)) for timing in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def expected_exponent(complexity, volumes):
+    """
+    Returns the growth exponent given complexity class has over given
+    volumes.
+    """
+    try:
+        function = COMPLEXITY_CLASSES[complexity]
+    except KeyError:
+        raise ValueError(
+            'Unknown complexity class %r, use one of %s.' % (
+                complexity, ', '.join(sorted(COMPLEXITY_CLASSES))
+            )
+        )
+    return growth_exponent(volumes, [function(volume) for volume in volumes])
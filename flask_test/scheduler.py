@@ -0,0 +1,222 @@
+import os
+import tempfile
+
+from flask import json
+
+
+class TestScheduler(object):
+    """
+    Records historical test durations and uses them to reorder test runs.
+
+    Durations are kept per test node id together with the setup and
+    teardown cost of every class (or fork) level test case, which is
+    attributed to the class as a whole. Tests are then grouped (class level
+    test cases always stay together), fast groups are run first and the
+    most expensive groups are spread evenly over the given number of
+    workers.
+
+    With more than one worker every class level group is marked with
+    ``xdist_group``, so run pytest-xdist with ``--dist loadgroup`` to pin
+    each group to a single worker and pay its class setup only once.
+
+    :param path: file the durations are persisted to
+    :param time_budget: tests or class groups slower than this many
+        seconds are moved to a separate "slow" lane at the end of the run
+    :param workers: number of workers (e.g. pytest-xdist processes) the
+        run is balanced over
+    """
+    __test__ = False
+
+    slow_marker = 'slow'
+
+    def __init__(self, path='.flask_test_durations', time_budget=None,
+                 workers=1):
+        self.path = path
+        self.time_budget = time_budget
+        self.workers = workers
+        self.durations = {}
+        self.class_durations = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            # Missing or damaged files only cost the ordering of this run.
+            return
+        self.durations.update(data.get('tests', {}))
+        self.class_durations.update(data.get('classes', {}))
+
+    def save(self):
+        durations = self.durations
+        class_durations = self.class_durations
+        # Other workers may have saved in the meantime, merge their results
+        # instead of overwriting them.
+        self.durations = {}
+        self.class_durations = {}
+        self.load()
+        self.durations.update(durations)
+        self.class_durations.update(class_durations)
+        # Replace the file in one step so concurrent workers never load a
+        # partially written file.
+        fd, path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        with os.fdopen(fd, 'w') as f:
+            json.dump(
+                {'tests': self.durations, 'classes': self.class_durations},
+                f,
+                indent=2,
+                sort_keys=True
+            )
+        os.rename(path, self.path)
+
+    def record(self, nodeid, duration):
+        self.durations[nodeid] = duration
+
+    def record_class(self, cls, duration):
+        self.class_durations[_class_key(cls)] = duration
+
+    def duration(self, item):
+        return self.durations.get(item.nodeid, self.default_duration)
+
+    @property
+    def default_duration(self):
+        """
+        Duration assumed for tests that have not been run before. Unknown
+        tests are treated as average so they are neither starved nor
+        front-loaded.
+        """
+        if not self.durations:
+            return 0.0
+        return sum(self.durations.values()) / len(self.durations)
+
+    def group(self, items):
+        """
+        Groups given items so that tests sharing a class level setup are
+        kept together. Returns a list of ``(cost, items)`` tuples where cost
+        includes the class setup and teardown cost.
+        """
+        groups = []
+        class_groups = {}
+        for item in items:
+            cls = getattr(item, 'cls', None)
+            if getattr(cls, 'setup_level', None) in ('class', 'fork'):
+                key = _class_key(cls)
+                if key not in class_groups:
+                    class_groups[key] = [
+                        self.class_durations.get(key, 0.0), []
+                    ]
+                    groups.append(class_groups[key])
+                class_groups[key][0] += self.duration(item)
+                class_groups[key][1].append(item)
+            else:
+                groups.append([self.duration(item), [item]])
+        return [tuple(group) for group in groups]
+
+    def order(self, items):
+        """
+        Returns given items reordered for the fastest feedback. Tests and
+        class groups over the time budget are marked with
+        :attr:`slow_marker` and moved to the end.
+        """
+        groups = sorted(self.group(items), key=lambda group: group[0])
+        if self.workers > 1:
+            for cost, group_items in groups:
+                cls = getattr(group_items[0], 'cls', None)
+                if getattr(cls, 'setup_level', None) in ('class', 'fork'):
+                    marker = _xdist_group(_class_key(cls))
+                    for item in group_items:
+                        item.add_marker(marker)
+        fast = groups
+        slow = []
+        if self.time_budget is not None:
+            fast = [g for g in groups if g[0] <= self.time_budget]
+            slow = [g for g in groups if g[0] > self.time_budget]
+            for cost, group_items in slow:
+                for item in group_items:
+                    item.add_marker(self.slow_marker)
+        return self._balance(fast) + self._balance(slow)
+
+    def _balance(self, groups):
+        """
+        Distributes the groups over workers using the longest processing
+        time first rule and returns them in the order of their simulated
+        start time, so that expensive class groups end up running in
+        parallel on different workers instead of back to back.
+        """
+        if self.workers <= 1:
+            return [item for cost, items in groups for item in items]
+
+        queues = [[0.0, []] for i in range(self.workers)]
+        for cost, items in sorted(groups, key=lambda g: -g[0]):
+            queue = min(queues, key=lambda q: q[0])
+            queue[0] += cost
+            queue[1].append((cost, items))
+
+        scheduled = []
+        for total, queue in queues:
+            start = 0.0
+            for cost, items in sorted(queue, key=lambda g: g[0]):
+                scheduled.append((start, cost, items))
+                start += cost
+        scheduled.sort(key=lambda g: (g[0], g[1]))
+        return [item for _, _, items in scheduled for item in items]
+
+
+class SchedulerPlugin(object):
+    """
+    pytest plugin that feeds a :class:`TestScheduler`. Register it in your
+    ``conftest.py``::
+
+        def pytest_configure(config):
+            config.pluginmanager.register(
+                SchedulerPlugin(TestScheduler(time_budget=5))
+            )
+    """
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.phases = {}
+
+    def pytest_configure(self, config):
+        config.addinivalue_line(
+            'markers',
+            '%s: test exceeds the TestScheduler time budget' %
+            self.scheduler.slow_marker
+        )
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        items[:] = self.scheduler.order(items)
+
+    def pytest_runtest_logreport(self, report):
+        self.phases.setdefault(report.nodeid, {})[report.when] = (
+            report.duration
+        )
+
+    def pytest_sessionfinish(self, session):
+        for item in getattr(session, 'items', []):
+            cls = getattr(item, 'cls', None)
+            phases = self.phases.get(item.nodeid)
+            if phases is not None:
+                if getattr(cls, 'setup_level', None) in ('class', 'fork'):
+                    # Setup and teardown of class level tests are
+                    # attributed to the class below.
+                    self.scheduler.record(item.nodeid, phases.get('call', 0))
+                else:
+                    # For method level tests create_app and the setup
+                    # delegators run in the setup and teardown phases.
+                    self.scheduler.record(item.nodeid, sum(phases.values()))
+            duration = getattr(cls, 'class_setup_duration', None)
+            if duration is not None:
+                self.scheduler.record_class(cls, duration)
+        self.scheduler.save()
+
+
+def _class_key(cls):
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+def _xdist_group(name):
+    from pytest import mark
+    return mark.xdist_group(name)
@@ -0,0 +1,115 @@
+from collections import deque, namedtuple
+from timeit import default_timer
+
+from flask import (
+    got_request_exception,
+    request_finished,
+    request_started,
+    template_rendered,
+)
+from flask.ext.login import (
+    user_logged_in,
+    user_logged_out,
+    user_unauthorized,
+)
+
+
+SignalEvent = namedtuple(
+    'SignalEvent',
+    ['index', 'timestamp', 'name', 'kwargs']
+)
+
+
+DEFAULT_SIGNALS = {
+    'request_started': request_started,
+    'request_finished': request_finished,
+    'got_request_exception': got_request_exception,
+    'template_rendered': template_rendered,
+    'user_logged_in': user_logged_in,
+    'user_logged_out': user_logged_out,
+    'user_unauthorized': user_unauthorized,
+}
+
+
+class SignalRecorder(object):
+    """
+    Records signals sent by an application into a bounded ring buffer.
+
+    The recorder subscribes to the signals once, for the given app as
+    sender only. The signals only hold weak references to its receivers,
+    which live as long as the recorder itself. Neither the recorder nor its
+    events reference the app, so when the app is garbage collected the
+    recorder goes with it and blinker drops the dead receivers.
+
+    Tests read their own slice of the buffer by taking a :meth:`mark`
+    before running and passing it to :meth:`events`. Events older than
+    `maxlen` signals are discarded.
+
+    :param app: Flask application whose signals to record
+    :param signals: dict of signal names to blinker signals, defaults to
+        :data:`DEFAULT_SIGNALS`
+    :param maxlen: maximum number of events kept
+    """
+    def __init__(self, app, signals=None, maxlen=10000):
+        if signals is None:
+            signals = DEFAULT_SIGNALS
+        self.buffer = deque(maxlen=maxlen)
+        self.count = 0
+        self.receivers = []
+        for name, signal in signals.items():
+            receiver = self._receiver(name)
+            self.receivers.append(receiver)
+            signal.connect(receiver, sender=app)
+
+    def _receiver(self, name):
+        def receive(sender, **kwargs):
+            self.count += 1
+            self.buffer.append(
+                SignalEvent(self.count, default_timer(), name, kwargs)
+            )
+        return receive
+
+    def mark(self):
+        return self.count
+
+    def events(self, since=0, name=None):
+        """
+        Returns the events recorded after given mark, optionally only the
+        ones of given signal name. Only the events after the mark are
+        visited, walking back from the newest one.
+        """
+        events = []
+        for event in reversed(self.buffer):
+            if event.index <= since:
+                break
+            if name is None or event.name == name:
+                events.append(event)
+        events.reverse()
+        return events
+
+    def request_durations(self, since=0):
+        """
+        Returns the durations in seconds of the requests that finished
+        after given mark, measured from `request_started` to
+        `request_finished`.
+        """
+        durations = []
+        started = []
+        for event in self.events(since):
+            if event.name == 'request_started':
+                started.append(event.timestamp)
+            elif event.name == 'request_finished' and started:
+                durations.append(event.timestamp - started.pop())
+        return durations
+
+
+def signal_recorder(app, signals=None, maxlen=10000):
+    """
+    Returns the :class:`SignalRecorder` of given app, creating and
+    subscribing it on first use.
+    """
+    if 'flask_test.signals' not in app.extensions:
+        app.extensions['flask_test.signals'] = SignalRecorder(
+            app, signals, maxlen
+        )
+    return app.extensions['flask_test.signals']
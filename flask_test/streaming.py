@@ -0,0 +1,106 @@
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class StreamResult(object):
+    """
+    Measurements of a streamed response consumed chunk by chunk.
+
+    `ttfb` (time to first byte), `duration` and `chunk_times` are in
+    seconds since the request was started; `chunks` holds the size of each
+    chunk in bytes. `peak_buffered_bytes` is the peak memory allocated
+    while the response was produced, or `None` when memory was not traced.
+    """
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.chunks = []
+        self.chunk_times = []
+        self.data = None
+        self.duration = None
+        self.peak_buffered_bytes = None
+
+    @property
+    def ttfb(self):
+        if not self.chunk_times:
+            return self.duration
+        return self.chunk_times[0]
+
+    @property
+    def total_bytes(self):
+        return sum(self.chunks)
+
+    def __repr__(self):
+        return '<StreamResult %d chunks, %d bytes, ttfb %.4fs of %.4fs>' % (
+            len(self.chunks), self.total_bytes, self.ttfb, self.duration
+        )
+
+
+def consume_stream(client, *args, **kwargs):
+    """
+    Issues a request with given test client without buffering the response
+    and consumes the response iterator chunk by chunk.
+
+    :param trace_memory: trace peak memory use with :mod:`tracemalloc`;
+        this slows the request down considerably. Requires Python 3.4 or
+        later, and Python 3.9 or later when tracemalloc is already tracing
+        (the peak can not be reset before that)
+    :param keep_data: store the joined chunks as `result.data`
+    :returns: :class:`StreamResult`
+    """
+    trace_memory = kwargs.pop('trace_memory', False)
+    keep_data = kwargs.pop('keep_data', False)
+    if trace_memory and tracemalloc is None:
+        raise RuntimeError('Memory tracing requires Python 3.4 or later.')
+    if (
+        trace_memory and tracemalloc.is_tracing() and
+        not hasattr(tracemalloc, 'reset_peak')
+    ):
+        raise RuntimeError(
+            'tracemalloc is already tracing and its peak includes earlier '
+            'allocations, memory tracing requires Python 3.9 or later here.'
+        )
+
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if trace_memory:
+        baseline = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    kwargs['buffered'] = False
+    started = default_timer()
+    try:
+        response = client.open(*args, **kwargs)
+        result = StreamResult(response)
+        data = []
+        try:
+            for chunk in response.response:
+                result.chunk_times.append(default_timer() - started)
+                result.chunks.append(len(chunk))
+                if keep_data:
+                    data.append(chunk)
+        finally:
+            if hasattr(response, 'close'):
+                response.close()
+        result.duration = default_timer() - started
+        if keep_data:
+            result.data = b''.join(
+                chunk.encode(response.charset)
+                if not isinstance(chunk, bytes) else chunk
+                for chunk in data
+            )
+        if trace_memory:
+            result.peak_buffered_bytes = (
+                tracemalloc.get_traced_memory()[1] - baseline
+            )
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    return result
@@ -1,15 +1,23 @@
-from flask import json, template_rendered, _request_ctx_stack
+from flask import json, _request_ctx_stack
+
+from .profiling import profiled_test_client
+from .signals import signal_recorder
 
 
 class ViewSetup(object):
     def setup(self, obj, app):
         obj.client = app.test_client()
         obj.xhr_client = xhr_test_client(obj, app.test_client())
+        if obj.profile_requests:
+            obj.client = profiled_test_client(obj, obj.client)
+            obj.xhr_client = profiled_test_client(obj, obj.xhr_client)
         obj._ctx = app.test_request_context()
         obj._ctx.push()
 
-        obj.templates = []
-        template_rendered.connect(obj._add_template)
+        obj.signal_recorder = signal_recorder(
+            app, obj.recorded_signals, obj.signal_buffer_size
+        )
+        obj._signal_mark = obj.signal_recorder.mark()
 
     def teardown(self, obj):
         obj.client = None
@@ -18,7 +26,7 @@ class ViewSetup(object):
             _request_ctx_stack.top.pop()
         obj._ctx.pop()
         obj._ctx = None
-        template_rendered.disconnect(obj._add_template)
+        obj.signal_recorder = None
 
 
 def xhr_test_client(test_case, client):
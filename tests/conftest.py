@@ -0,0 +1 @@
+from flask_test.fork import pytest_pyfunc_call  # noqa
@@ -0,0 +1,135 @@
+import time
+
+from flask import Flask, jsonify, request
+from flask.ext.sqlalchemy import SQLAlchemy
+from flask_test import TestCase
+from flask_test import caching
+from pytest import raises
+
+
+ETAG = 'v1'
+
+
+def conditional(response):
+    response.cache_control.max_age = 60
+    response.set_etag(ETAG)
+    return response.make_conditional(request)
+
+
+class TestCacheability(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        def render():
+            time.sleep(0.05)
+            return jsonify(data=[1, 2, 3])
+
+        @app.route('/cached')
+        def cached():
+            if ETAG in request.if_none_match:
+                return conditional(app.response_class())
+            return conditional(render())
+
+        @app.route('/rerendered')
+        def rerendered():
+            return conditional(render())
+
+        @app.route('/ignores-validators')
+        def ignores_validators():
+            response = render()
+            response.cache_control.max_age = 60
+            response.set_etag(ETAG)
+            return response
+
+        @app.route('/uncached')
+        def uncached():
+            return jsonify(data=[1, 2, 3])
+
+        return app
+
+    def test_assert_cacheable(self):
+        report = self.assert_cacheable('/cached')
+        assert report.conditional_status == 304
+        assert report.problems == []
+        assert caching.reports[-1] is report
+
+    def test_assert_cacheable_fails_without_validators(self):
+        with raises(AssertionError):
+            self.assert_cacheable('/uncached')
+        assert caching.reports[-1].problems == [
+            'no ETag or Last-Modified header',
+            'no Cache-Control header',
+        ]
+
+    def test_assert_cacheable_fails_without_304(self):
+        with raises(AssertionError):
+            self.assert_cacheable('/ignores-validators')
+        assert caching.reports[-1].problems[0] == (
+            'conditional request returned 200'
+        )
+
+    def test_assert_cacheable_fails_when_304_repeats_work(self):
+        with raises(AssertionError):
+            self.assert_cacheable('/rerendered')
+        assert caching.reports[-1].conditional_status == 304
+        assert caching.reports[-1].problems[0].startswith(
+            'conditional request took'
+        )
+
+    def test_format_reports(self):
+        report = self.assert_cacheable('/cached')
+        lines = caching.format_reports([report])
+        assert lines[0] == '/cached: cacheable'
+
+    def test_format_reports_without_durations(self):
+        report = caching.CacheReport(
+            '/cached', ETAG, None, 'max-age=60', 304, None, None, None,
+            None, []
+        )
+        lines = caching.format_reports([report])
+        assert lines[2] == '    conditional: 304, queries None -> None, ' \
+            'n/a -> n/a'
+
+
+class TestCacheabilityWithQueries(TestCase):
+    in_memory_database = True
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        db = SQLAlchemy()
+        db.init_app(app)
+
+        class Article(db.Model):
+            __tablename__ = 'cached_article'
+            id = db.Column(db.Integer, primary_key=True)
+
+        def render():
+            return jsonify(count=Article.query.count())
+
+        @app.route('/cached')
+        def cached():
+            if ETAG in request.if_none_match:
+                return conditional(app.response_class())
+            return conditional(render())
+
+        @app.route('/rerendered')
+        def rerendered():
+            return conditional(render())
+
+        return app
+
+    def test_conditional_request_skips_queries(self):
+        report = self.assert_cacheable('/cached')
+        assert report.queries == 1
+        assert report.conditional_queries == 0
+
+    def test_fails_when_conditional_request_runs_queries(self):
+        with raises(AssertionError):
+            self.assert_cacheable('/rerendered')
+        assert caching.reports[-1].problems == [
+            'conditional request executed 1 of 1 queries'
+        ]
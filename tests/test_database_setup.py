@@ -17,3 +17,45 @@ class DatabaseSetupTestCase(TestCase):
 
         self.Model = Model
         return app
+
+
+class TestInMemoryDatabase(DatabaseSetupTestCase):
+    in_memory_database = True
+
+    def test_uses_sqlite_in_memory(self):
+        assert self.db.engine.url.drivername == 'sqlite'
+        assert self.db.engine.url.database is None
+
+    def test_creates_schema(self):
+        self.db.session.add(self.Model(id=1))
+        self.db.session.commit()
+        assert self.Model.query.count() == 1
+
+    def test_deletes_data_between_tests(self):
+        assert self.Model.query.count() == 0
+        self.db.session.add(self.Model(id=1))
+        self.db.session.commit()
+
+
+class TestInMemoryDatabaseRecreatesChangedTables(TestCase):
+    in_memory_database = True
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        db = SQLAlchemy()
+        db.init_app(app)
+
+        class Model(db.Model):
+            __tablename__ = 'model'
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.Unicode(255))
+
+        self.Model = Model
+        return app
+
+    def test_uses_current_table_definition(self):
+        self.db.session.add(self.Model(id=1, name=u'name'))
+        self.db.session.commit()
+        assert self.Model.query.one().name == u'name'
@@ -0,0 +1,81 @@
+from flask import Flask
+from flask_test import TestCase
+from pytest import raises
+
+
+PAGE = u'''<!DOCTYPE html>
+<html>
+  <body>
+    <div id="content" class="page wide">
+      <h1>Tags</h1>
+      <ul class="tags">
+        <li class="tag">python</li>
+        <li class="tag active">flask &amp; werkzeug</li>
+      </ul>
+      <form><input type="text" name="q"><br></form>
+    </div>
+  </body>
+</html>'''
+
+
+IMPLIED_END_TAGS_PAGE = u'''<ul><li>a<li>b</ul>
+<p>first<p>second
+<div>block</div>
+<table><tr><td>1<td>2<tr><td>3</table>'''
+
+
+class TestHtmlResponse(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        @app.route('/')
+        def index():
+            return PAGE
+
+        @app.route('/implied')
+        def implied():
+            return IMPLIED_END_TAGS_PAGE
+
+        return app
+
+    def test_parses_body_once(self):
+        response = self.client.get('/')
+        assert response.html is response.html
+
+    def test_select_by_id(self):
+        response = self.client.get('/')
+        element = response.html.select_one('#content')
+        assert element.tag == 'div'
+        assert element.classes == ['page', 'wide']
+
+    def test_select_with_combinators(self):
+        response = self.client.get('/')
+        assert len(response.html.select('div ul > li.tag')) == 2
+        assert response.html.select('body > li') == []
+
+    def test_select_by_attribute(self):
+        response = self.client.get('/')
+        element = response.html.select_one('input[name="q"]')
+        assert element.attrs['type'] == 'text'
+
+    def test_assert_selector(self):
+        response = self.client.get('/')
+        self.assert_selector(response, 'li.tag', count=2)
+        self.assert_selector(response, '.active', text=u'flask & werkzeug')
+        self.assert_no_selector(response, '.missing')
+
+    def test_assert_selector_fails(self):
+        response = self.client.get('/')
+        with raises(AssertionError):
+            self.assert_selector(response, 'h1', text='Users')
+
+    def test_closes_implied_end_tags(self):
+        html = self.client.get('/implied').html
+        assert [li.text for li in html.select('li')] == ['a', 'b']
+        assert html.select('li li') == []
+        assert [p.text for p in html.select('p')] == ['first', 'second\n']
+        assert html.select('p div') == []
+        assert [tr.text for tr in html.select('tr')] == ['12', '3']
+        assert len(html.select('tr > td')) == 3
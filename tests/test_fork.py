@@ -0,0 +1,72 @@
+from flask import Flask
+from flask.ext.sqlalchemy import SQLAlchemy
+from flask_test import TestCase
+from flask_test.fork import ForkedTestFailure, run_forked
+from pytest import raises
+from tests import TagAPI
+
+
+class TestForkLevelSetup(TestCase):
+    setup_level = 'fork'
+
+    @classmethod
+    def create_app(cls):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        tag_view = TagAPI.as_view('tag')
+        app.add_url_rule('/tags/<int:tag_id>', view_func=tag_view,
+                         methods=['GET', 'PUT', 'DELETE'])
+
+        return app
+
+    def test_method1(self):
+        assert 'CHANGED' not in self.app.config
+        self.app.config['CHANGED'] = True
+
+    def test_method2(self):
+        assert 'CHANGED' not in self.app.config
+        self.app.config['CHANGED'] = True
+
+    def test_uses_client(self):
+        self.assert200(self.client.get('/tags/1'))
+
+
+class TestForkLevelDatabase(TestCase):
+    setup_level = 'fork'
+    in_memory_database = True
+
+    @classmethod
+    def create_app(cls):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        db = SQLAlchemy()
+        db.init_app(app)
+
+        class Model(db.Model):
+            __tablename__ = 'forked_model'
+            id = db.Column(db.Integer, primary_key=True)
+
+        cls.Model = Model
+        return app
+
+    def test_method1(self):
+        assert self.Model.query.count() == 0
+        self.db.session.add(self.Model(id=1))
+        self.db.session.commit()
+
+    def test_method2(self):
+        assert self.Model.query.count() == 0
+        self.db.session.add(self.Model(id=1))
+        self.db.session.commit()
+
+
+def test_run_forked_reports_failures():
+    def fail():
+        assert False, 'failed in child'
+
+    with raises(ForkedTestFailure) as excinfo:
+        run_forked(fail)
+    assert 'failed in child' in str(excinfo.value)
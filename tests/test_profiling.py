@@ -0,0 +1,46 @@
+import os
+
+from flask import Flask, redirect
+from flask_test import TestCase
+from tests import TagAPI
+
+
+class TestRequestProfiling(TestCase):
+    profile_requests = True
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        tag_view = TagAPI.as_view('tag')
+        app.add_url_rule('/tags/<int:tag_id>', view_func=tag_view,
+                         methods=['GET', 'PUT', 'DELETE'])
+
+        @app.route('/old-tags/<int:tag_id>')
+        def old_tag(tag_id):
+            return redirect('/tags/%d' % tag_id)
+
+        return app
+
+    def test_attaches_profile_to_response(self):
+        response = self.client.get('/tags/1')
+        assert response.profile.total_calls > 0
+
+    def test_attaches_profile_to_xhr_response(self):
+        response = self.xhr_client.get('/tags/1')
+        assert response.profile.total_calls > 0
+
+    def test_attaches_profile_to_redirected_response(self):
+        response = self.client.get('/old-tags/1', follow_redirects=True)
+        assert response.status_code == 200
+        assert response.profile.total_calls > 0
+
+    def test_dumps_profiles_over_threshold(self, tmpdir):
+        self.profile_threshold = 0
+        self.profile_dir = str(tmpdir)
+        self.client.get('/tags/1')
+        assert sorted(os.listdir(self.profile_dir)) == [
+            'TestRequestProfiling-_tags_1.collapsed',
+            'TestRequestProfiling-_tags_1.prof',
+        ]
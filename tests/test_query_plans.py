@@ -0,0 +1,78 @@
+from flask import Flask, jsonify
+from flask.ext.sqlalchemy import SQLAlchemy
+from flask_test import TestCase
+from flexmock import flexmock
+from pytest import raises
+
+
+class TestQueryPlanCapture(TestCase):
+    in_memory_database = True
+    explain_queries = True
+    sequential_scan_threshold = 10
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        db = SQLAlchemy()
+        db.init_app(app)
+
+        class Model(db.Model):
+            __tablename__ = 'query_plan_model'
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.Unicode(255), nullable=False)
+
+        class Child(db.Model):
+            __tablename__ = 'query_plan_child'
+            id = db.Column(db.Integer, primary_key=True)
+            model_id = db.Column(
+                db.Integer, db.ForeignKey(Model.id), nullable=False
+            )
+
+        @app.route('/models/<name>')
+        def models_by_name(name):
+            return jsonify(count=Model.query.filter_by(name=name).count())
+
+        self.Model = Model
+        self.Child = Child
+        return app
+
+    def test_primary_key_lookup(self):
+        self.generate_rows([self.Model], 20)
+        self.Model.query.get(1)
+        self.assert_no_sequential_scans()
+
+    def test_ignores_generated_rows(self):
+        self.generate_rows([self.Model, self.Child], 20)
+        self.assert_no_sequential_scans()
+
+    def test_small_table_scan(self):
+        self.generate_rows([self.Model], 5)
+        self.client.get('/models/name-1')
+        self.assert_no_sequential_scans()
+
+    def test_large_table_scan(self):
+        self.generate_rows([self.Model], 20)
+        self.client.get('/models/name-1')
+        self.client.get('/models/name-2')
+        scans = self.query_plans.sequential_scans
+        assert len(scans) == 1
+        assert scans[0].table == 'query_plan_model'
+        assert scans[0].rows == 20
+        assert scans[0].view == 'models_by_name'
+        with raises(AssertionError):
+            self.assert_no_sequential_scans()
+
+    def test_explains_each_statement_once(self):
+        self.client.get('/models/name-1')
+        self.client.get('/models/name-2')
+        statements = [
+            s for s in self.query_plans.plans if 'query_plan_model' in s
+        ]
+        assert len(statements) == 1
+
+    def test_counts_rows_once_between_writes(self):
+        self.generate_rows([self.Model], 5)
+        flexmock(self.query_plans).should_call('count_rows').once()
+        self.client.get('/models/name-1')
+        self.client.get('/models/name-2')
@@ -0,0 +1,91 @@
+from flask import Flask
+from flask.ext.sqlalchemy import SQLAlchemy
+from flask_test import base, TestCase
+from flask_test.scaling import expected_exponent, growth_exponent
+from flexmock import flexmock
+from pytest import raises
+
+
+class TestScalingAssertions(TestCase):
+    in_memory_database = True
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        db = SQLAlchemy()
+        db.init_app(app)
+
+        class Category(db.Model):
+            __tablename__ = 'category'
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(10), nullable=False, unique=True)
+
+        class Article(db.Model):
+            __tablename__ = 'article'
+            id = db.Column(db.Integer, primary_key=True)
+            title = db.Column(db.Unicode(255), nullable=False)
+            published = db.Column(db.Boolean, nullable=False)
+            created_at = db.Column(db.DateTime, nullable=False)
+            category_id = db.Column(
+                db.Integer, db.ForeignKey(Category.id), nullable=False
+            )
+
+        self.Category = Category
+        self.Article = Article
+        return app
+
+    def test_generate_rows(self):
+        self.generate_rows([self.Article, self.Category], 50)
+        assert self.Category.query.count() == 50
+        assert self.Article.query.count() == 50
+        category_ids = set(c.id for c in self.Category.query)
+        assert set(a.category_id for a in self.Article.query) <= category_ids
+
+    def test_generate_rows_appends(self):
+        self.generate_rows([self.Category], 10)
+        self.generate_rows([self.Category], 10)
+        assert self.Category.query.count() == 20
+
+    def test_assert_scales(self):
+        timings = self.assert_scales(
+            lambda: self.Article.query.count(),
+            [self.Category, self.Article],
+            volumes=(10, 20, 40)
+        )
+        assert [volume for volume, _ in timings] == [10, 20, 40]
+
+    def test_assert_scales_detects_faster_growth(self):
+        flexmock(base).should_receive('measure').and_return(
+            0.001, 0.004, 0.016
+        ).one_by_one()
+        with raises(AssertionError):
+            self.assert_scales(
+                lambda: None,
+                [self.Category, self.Article],
+                volumes=(10, 20, 40)
+            )
+
+    def test_assert_scales_accepts_declared_growth(self):
+        flexmock(base).should_receive('measure').and_return(
+            0.001, 0.004, 0.016
+        ).one_by_one()
+        self.assert_scales(
+            lambda: None,
+            [self.Category, self.Article],
+            volumes=(10, 20, 40),
+            complexity='quadratic'
+        )
+
+
+def test_growth_exponent():
+    assert round(growth_exponent([10, 20, 40], [1, 2, 4]), 6) == 1
+    assert round(growth_exponent([10, 20, 40], [1, 4, 16]), 6) == 2
+
+
+def test_expected_exponent():
+    assert expected_exponent('constant', [100, 1000]) == 0
+    assert round(expected_exponent('quadratic', [100, 1000]), 6) == 2
+    assert 1 < expected_exponent('linearithmic', [100, 1000]) < 1.5
+    with raises(ValueError):
+        expected_exponent('exponential', [100, 1000])
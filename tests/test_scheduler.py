@@ -0,0 +1,157 @@
+from flask_test import SchedulerPlugin, TestCase, TestScheduler
+
+
+class ClassLevelCase(TestCase):
+    setup_level = 'class'
+
+
+class MethodLevelCase(TestCase):
+    pass
+
+
+class Item(object):
+    def __init__(self, nodeid, cls):
+        self.nodeid = nodeid
+        self.cls = cls
+        self.markers = []
+
+    def add_marker(self, marker):
+        self.markers.append(marker)
+
+
+class Report(object):
+    def __init__(self, nodeid, when, duration):
+        self.nodeid = nodeid
+        self.when = when
+        self.duration = duration
+
+
+class Session(object):
+    def __init__(self, items):
+        self.items = items
+
+
+class Config(object):
+    def __init__(self):
+        self.ini_lines = []
+
+    def addinivalue_line(self, name, line):
+        self.ini_lines.append((name, line))
+
+
+class TestTestScheduler(object):
+    def setup_method(self, method):
+        self.scheduler = TestScheduler(path='/nonexistent/durations')
+        self.scheduler.durations = {'fast': 0.1, 'slow': 10.0, 'a': 1, 'b': 1}
+        self.scheduler.record_class(ClassLevelCase, 5.0)
+        self.items = [
+            Item('slow', MethodLevelCase),
+            Item('a', ClassLevelCase),
+            Item('fast', MethodLevelCase),
+            Item('b', ClassLevelCase),
+        ]
+
+    def test_runs_fast_tests_first(self):
+        ordered = self.scheduler.order(self.items)
+        assert [item.nodeid for item in ordered] == ['fast', 'a', 'b', 'slow']
+
+    def test_attributes_class_setup_cost_to_class(self):
+        groups = self.scheduler.group(self.items)
+        assert (7.0, [self.items[1], self.items[3]]) in groups
+
+    def test_moves_tests_over_time_budget_to_slow_lane(self):
+        self.scheduler.time_budget = 8
+        ordered = self.scheduler.order(self.items)
+        assert ordered[-1].nodeid == 'slow'
+        assert ordered[-1].markers == ['slow']
+        assert ordered[0].markers == []
+
+    def test_spreads_expensive_groups_over_workers(self):
+        self.scheduler.workers = 2
+        ordered = self.scheduler.order(self.items)
+        assert [item.nodeid for item in ordered] == ['fast', 'slow', 'a', 'b']
+
+    def test_pins_class_level_groups_to_one_worker(self):
+        self.scheduler.workers = 2
+        self.scheduler.order(self.items)
+        markers = self.items[1].markers
+        assert len(markers) == 1
+        assert markers[0].name == 'xdist_group'
+        assert markers[0].args == ('tests.test_scheduler.ClassLevelCase',)
+        assert self.items[3].markers == markers
+        assert self.items[0].markers == []
+
+    def test_save_merges_with_saved_durations(self, tmpdir):
+        path = str(tmpdir.join('durations'))
+        first = TestScheduler(path=path)
+        first.record('a', 1.0)
+        first.record_class(ClassLevelCase, 2.0)
+        second = TestScheduler(path=path)
+        second.record('b', 3.0)
+        first.save()
+        second.save()
+
+        loaded = TestScheduler(path=path)
+        assert loaded.durations == {'a': 1.0, 'b': 3.0}
+        assert loaded.class_durations == {
+            'tests.test_scheduler.ClassLevelCase': 2.0
+        }
+
+    def test_save_replaces_file_atomically(self, tmpdir):
+        path = str(tmpdir.join('durations'))
+        scheduler = TestScheduler(path=path)
+        scheduler.record('a', 1.0)
+        scheduler.save()
+        assert tmpdir.listdir() == [tmpdir.join('durations')]
+
+    def test_load_ignores_damaged_file(self, tmpdir):
+        path = tmpdir.join('durations')
+        path.write('{"tests": {"a": 1.')
+        scheduler = TestScheduler(path=str(path))
+        assert scheduler.durations == {}
+        scheduler.record('b', 2.0)
+        scheduler.save()
+        assert TestScheduler(path=str(path)).durations == {'b': 2.0}
+
+
+class TestSchedulerPlugin(object):
+    def setup_method(self, method):
+        self.scheduler = TestScheduler(path='/nonexistent/durations')
+        self.scheduler.save = lambda: None
+        self.plugin = SchedulerPlugin(self.scheduler)
+
+    def test_registers_slow_marker(self):
+        config = Config()
+        self.plugin.pytest_configure(config)
+        assert config.ini_lines[0][0] == 'markers'
+        assert config.ini_lines[0][1].startswith('slow:')
+
+    def test_records_all_phases_of_method_level_tests(self):
+        item = Item('method', MethodLevelCase)
+        for when, duration in [('setup', 1), ('call', 2), ('teardown', 3)]:
+            self.plugin.pytest_runtest_logreport(
+                Report('method', when, duration)
+            )
+        self.plugin.pytest_sessionfinish(Session([item]))
+        assert self.scheduler.durations == {'method': 6}
+
+    def test_attributes_setup_of_class_level_tests_to_class(self):
+        class Case(ClassLevelCase):
+            class_setup_duration = 4.0
+
+        item = Item('class', Case)
+        for when, duration in [('setup', 5), ('call', 2), ('teardown', 3)]:
+            self.plugin.pytest_runtest_logreport(
+                Report('class', when, duration)
+            )
+        self.plugin.pytest_sessionfinish(Session([item]))
+        assert self.scheduler.durations == {'class': 2}
+        assert self.scheduler.class_durations == {
+            'tests.test_scheduler.Case': 4.0
+        }
+
+    def test_orders_collected_items(self):
+        self.scheduler.durations = {'fast': 0.1, 'slow': 1.0}
+        items = [Item('slow', MethodLevelCase), Item('fast', MethodLevelCase)]
+        self.plugin.pytest_collection_modifyitems(None, None, items)
+        assert [item.nodeid for item in items] == ['fast', 'slow']
@@ -0,0 +1,93 @@
+from flask import Flask, flash, session
+from flask.sessions import SessionInterface, SessionMixin
+from flask_test import TestCase
+
+
+class ServerSideSession(dict, SessionMixin):
+    pass
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Keeps every session in memory under the same session id.
+    """
+    def __init__(self):
+        self.sessions = {}
+
+    def open_session(self, app, request):
+        return ServerSideSession(self.sessions.get('sid', {}))
+
+    def save_session(self, app, session, response):
+        self.sessions['sid'] = dict(session)
+        response.set_cookie(app.config['SESSION_COOKIE_NAME'], 'sid')
+
+
+class TestSessionInspection(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        @app.route('/flash')
+        def flash_messages():
+            flash('Saved.', 'success')
+            flash('Check your email.', 'info')
+            session['visited'] = True
+            return ''
+
+        return app
+
+    def test_get_session(self):
+        self.client.get('/flash')
+        assert self.get_session()['visited'] is True
+
+    def test_get_session_without_cookie(self):
+        assert self.get_session() == {}
+
+    def test_get_session_does_not_write_back(self):
+        self.client.get('/flash')
+        self.get_session()['visited'] = False
+        assert self.get_session()['visited'] is True
+
+    def test_get_flash_messages(self):
+        self.client.get('/flash')
+        assert self.get_flash_messages() == [
+            ('success', 'Saved.'),
+            ('info', 'Check your email.'),
+        ]
+
+    def test_get_flash_messages_with_category_filter(self):
+        self.client.get('/flash')
+        assert self.get_flash_messages(['info']) == [
+            ('info', 'Check your email.')
+        ]
+
+    def test_assert_flash_message(self):
+        self.client.get('/flash')
+        self.assert_flash_message('success', 'Saved.')
+        self.assert_flash_message('info', 'Check your email.')
+
+    def test_get_flash_messages_does_not_write_back(self):
+        self.client.get('/flash')
+        self.get_session()['_flashes'].append(('error', 'Injected.'))
+        assert len(self.get_flash_messages()) == 2
+
+
+class TestServerSideSessionInspection(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.session_interface = ServerSideSessionInterface()
+
+        @app.route('/visit/<page>')
+        def visit(page):
+            session['page'] = page
+            return ''
+
+        return app
+
+    def test_get_session_reloads_session(self):
+        self.client.get('/visit/first')
+        assert self.get_session()['page'] == 'first'
+        self.client.get('/visit/second')
+        assert self.get_session()['page'] == 'second'
@@ -0,0 +1,103 @@
+import gc
+
+from flask import Flask, render_template_string
+from flask.ext.login import LoginManager
+from flask import request_started
+from flask_test import TestCase, ViewSetup
+from tests import TagAPI
+
+
+class TestSignalRecorder(TestCase):
+    setup_level = 'class'
+
+    @classmethod
+    def create_app(cls):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        login_manager = LoginManager()
+        login_manager.init_app(app)
+        login_manager.user_loader(lambda user_id: None)
+
+        tag_view = TagAPI.as_view('tag')
+        app.add_url_rule('/tags/<int:tag_id>', view_func=tag_view,
+                         methods=['GET', 'PUT', 'DELETE'])
+
+        @app.route('/hello')
+        def hello():
+            return render_template_string(u'Hello {{ name }}', name=u'you')
+
+        return app
+
+    def test_records_templates(self):
+        self.client.get('/hello')
+        self.assert_context('name', u'you')
+        assert len(self.templates) == 1
+
+    def test_slices_events_per_test(self):
+        assert self.signal_events() == []
+        assert self.templates == []
+
+    def test_records_request_durations(self):
+        self.client.get('/tags/1')
+        self.client.get('/tags/1')
+        durations = self.signal_recorder.request_durations(self._signal_mark)
+        assert len(durations) == 2
+        assert all(duration >= 0 for duration in durations)
+
+    def test_requires_login(self):
+        with self.requires_login():
+            self.client.delete('/tags/1')
+
+    def test_resets_templates(self):
+        self.client.get('/hello')
+        self.templates = []
+        assert self.templates == []
+
+    def test_subscribes_once_per_app(self):
+        receivers = list(request_started.receivers_for(self.app))
+        other = TestSignalRecorder()
+        setup = ViewSetup()
+        setup.setup(other, self.app)
+        try:
+            assert other.signal_recorder is self.signal_recorder
+            assert list(request_started.receivers_for(self.app)) == receivers
+            self.client.get('/tags/1')
+            assert len(self.signal_events('request_started')) == 1
+        finally:
+            setup.teardown(other)
+
+    def test_events_after_mark(self):
+        mark = self.signal_recorder.mark()
+        self.client.get('/tags/1')
+        self.client.get('/hello')
+        events = self.signal_recorder.events(mark)
+        assert [event.index for event in events] == sorted(
+            event.index for event in events
+        )
+        assert all(event.index > mark for event in events)
+        assert len(self.signal_recorder.events(mark, 'request_started')) == 2
+
+
+class TestSignalRecorderCleanup(TestCase):
+    receiver_counts = []
+
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+        return app
+
+    def count_receivers(self):
+        gc.collect()
+        self.receiver_counts.append(len(request_started.receivers))
+
+    def test_first_app(self):
+        self.count_receivers()
+
+    def test_second_app(self):
+        self.count_receivers()
+
+    def test_does_not_accumulate_receivers(self):
+        self.count_receivers()
+        assert len(set(self.receiver_counts)) == 1
@@ -0,0 +1,67 @@
+import time
+
+from flask import Flask, Response
+from flask_test import TestCase
+from pytest import importorskip, raises
+
+
+class TestStreaming(TestCase):
+    def create_app(self):
+        app = Flask(__name__)
+        app.debug = True
+        app.secret_key = 'very secret'
+
+        def rows():
+            for index in range(10):
+                time.sleep(0.005)
+                yield (u'row %d\n' % index) * 1000
+
+        @app.route('/streamed')
+        def streamed():
+            return Response(rows(), mimetype='text/plain')
+
+        @app.route('/materialized')
+        def materialized():
+            return Response(iter(list(rows())), mimetype='text/plain')
+
+        def large_rows():
+            for index in range(10):
+                yield b'x' * 100000
+
+        @app.route('/large')
+        def large():
+            return Response(large_rows(), mimetype='text/plain')
+
+        @app.route('/large-materialized')
+        def large_materialized():
+            return Response(iter(list(large_rows())), mimetype='text/plain')
+
+        return app
+
+    def test_records_chunks(self):
+        result = self.stream('/streamed', keep_data=True)
+        assert result.status_code == 200
+        assert len(result.chunks) == 10
+        assert result.total_bytes == len(result.data)
+        assert result.ttfb < result.duration
+
+    def test_assert_streams(self):
+        self.assert_streams(self.stream('/streamed'))
+
+    def test_assert_streams_detects_materialized_response(self):
+        with raises(AssertionError):
+            self.assert_streams(self.stream('/materialized'))
+
+    def test_traces_peak_memory(self):
+        importorskip('tracemalloc')
+        result = self.stream('/large', trace_memory=True)
+        assert result.total_bytes == 1000000
+        assert 0 < result.peak_buffered_bytes < 500000
+        self.assert_streams(result, max_ttfb_ratio=1)
+
+    def test_assert_streams_detects_buffered_payload(self):
+        importorskip('tracemalloc')
+        result = self.stream('/large-materialized', trace_memory=True)
+        assert result.peak_buffered_bytes >= 1000000
+        with raises(AssertionError):
+            self.assert_streams(result, max_ttfb_ratio=1)